@@ -22,117 +22,159 @@
 # IN THE SOFTWARE.
 #
 
+from collections import OrderedDict, namedtuple
+try:
+   from sys import intern
+except ImportError:
+   pass   # Python 2 has intern() as a builtin
+try:
+   from types import MappingProxyType
+except ImportError:
+   # Python 2 has no read-only dict view; fall back to handing out the
+   # dict itself.
+   MappingProxyType = lambda d: d
+
 # This file defines all the available intrinsics in one place.
 #
 # The Intrinsic class corresponds one-to-one with nir_intrinsic_info
 # structure.
 
-class Intrinsic(object):
-   """Class that represents all the information about an intrinsic opcode.
+# Intrinsic deliberately stays in pure Python: the generators that consume
+# this table each run exactly once per build, so a compiled (Cython/C) spec
+# type would cost a build-time toolchain dependency for no measurable win
+# over the C-backed tuple layout below.
+
+class Intrinsic(namedtuple('Intrinsic',
+                           ('name', 'num_srcs', 'src_components', 'has_dest',
+                            'dest_components', 'num_indices', 'indices',
+                            'flags', 'sysval', 'bit_sizes'))):
+   """Frozen value type that represents all the information about an
+   intrinsic opcode.  Backed by a plain tuple, so instances are immutable
+   and hash/equality come for free.
    NOTE: this must be kept in sync with nir_intrinsic_info.
    """
-   def __init__(self, name, src_components, dest_components,
-                indices, flags, sysval, bit_sizes):
+   __slots__ = ()
+
+   def __new__(cls, name, num_srcs, src_components, dest_components,
+               num_indices, indices, flags, sysval, bit_sizes):
        """Parameters:
 
        - name: the intrinsic name
+       - num_srcs: len(src_components), precomputed at spec-build time
        - src_components: list of the number of components per src, 0 means
          vectorized instruction with number of components given in the
          num_components field in nir_intrinsic_instr.
        - dest_components: number of destination components, -1 means no
          dest, 0 means number of components given in num_components field
          in nir_intrinsic_instr.
+       - num_indices: len(indices), precomputed at spec-build time
        - indices: list of constant indicies
        - flags: list of semantic flags
        - sysval: is this a system-value intrinsic
        - bit_sizes: allowed dest bit_sizes
        """
-       assert isinstance(name, str)
-       assert isinstance(src_components, list)
-       if src_components:
-           assert isinstance(src_components[0], int)
-       assert isinstance(dest_components, int)
-       assert isinstance(indices, list)
-       if indices:
-           assert isinstance(indices[0], str)
-       assert isinstance(flags, list)
-       if flags:
-           assert isinstance(flags[0], str)
-       assert isinstance(sysval, bool)
-       if bit_sizes:
-           assert isinstance(bit_sizes[0], int)
-
-       self.name = name
-       self.num_srcs = len(src_components)
-       self.src_components = src_components
-       self.has_dest = (dest_components >= 0)
-       self.dest_components = dest_components
-       self.num_indices = len(indices)
-       self.indices = indices
-       self.flags = flags
-       self.sysval = sysval
-       self.bit_sizes = bit_sizes
+       return super(Intrinsic, cls).__new__(
+           cls, name, num_srcs, src_components, dest_components >= 0,
+           dest_components, num_indices, indices, flags, sysval, bit_sizes)
 
 #
 # Possible indices:
 #
 
 # A constant 'base' value that is added to an offset src:
-BASE = "NIR_INTRINSIC_BASE"
+BASE = intern("NIR_INTRINSIC_BASE")
 # For store instructions, a writemask:
-WRMASK = "NIR_INTRINSIC_WRMASK"
+WRMASK = intern("NIR_INTRINSIC_WRMASK")
 # The stream-id for GS emit_vertex/end_primitive intrinsics:
-STREAM_ID = "NIR_INTRINSIC_STREAM_ID"
+STREAM_ID = intern("NIR_INTRINSIC_STREAM_ID")
 # The clip-plane id for load_user_clip_plane intrinsics:
-UCP_ID = "NIR_INTRINSIC_UCP_ID"
+UCP_ID = intern("NIR_INTRINSIC_UCP_ID")
 # The amount of data, starting from BASE, that this instruction
 # may access.  This is used to provide bounds if the offset is
 # not constant.
-RANGE = "NIR_INTRINSIC_RANGE"
+RANGE = intern("NIR_INTRINSIC_RANGE")
 # The vulkan descriptor set binding for vulkan_resource_index
 # intrinsic
-DESC_SET = "NIR_INTRINSIC_DESC_SET"
+DESC_SET = intern("NIR_INTRINSIC_DESC_SET")
 # The vulkan descriptor set binding for vulkan_resource_index
 # intrinsic
-BINDING = "NIR_INTRINSIC_BINDING"
+BINDING = intern("NIR_INTRINSIC_BINDING")
 # Component offset
-COMPONENT = "NIR_INTRINSIC_COMPONENT"
+COMPONENT = intern("NIR_INTRINSIC_COMPONENT")
 # Interpolation mode (only meaningful for FS inputs)
-INTERP_MODE = "NIR_INTRINSIC_INTERP_MODE"
+INTERP_MODE = intern("NIR_INTRINSIC_INTERP_MODE")
 # A binary nir_op to use when performing a reduction or scan operation
-REDUCTION_OP = "NIR_INTRINSIC_REDUCTION_OP"
+REDUCTION_OP = intern("NIR_INTRINSIC_REDUCTION_OP")
 # Cluster size for reduction operations
-CLUSTER_SIZE = "NIR_INTRINSIC_CLUSTER_SIZE"
+CLUSTER_SIZE = intern("NIR_INTRINSIC_CLUSTER_SIZE")
 # Parameter index for a load_param intrinsic
-PARAM_IDX = "NIR_INTRINSIC_PARAM_IDX"
+PARAM_IDX = intern("NIR_INTRINSIC_PARAM_IDX")
 # Image dimensionality for image intrinsics
-IMAGE_DIM = "NIR_INTRINSIC_IMAGE_DIM"
+IMAGE_DIM = intern("NIR_INTRINSIC_IMAGE_DIM")
 # Non-zero if we are accessing an array image
-IMAGE_ARRAY = "NIR_INTRINSIC_IMAGE_ARRAY"
+IMAGE_ARRAY = intern("NIR_INTRINSIC_IMAGE_ARRAY")
 # Access qualifiers for image and memory access intrinsics
-ACCESS = "NIR_INTRINSIC_ACCESS"
+ACCESS = intern("NIR_INTRINSIC_ACCESS")
 # Image format for image intrinsics
-FORMAT = "NIR_INTRINSIC_FORMAT"
+FORMAT = intern("NIR_INTRINSIC_FORMAT")
 # Offset or address alignment
-ALIGN_MUL = "NIR_INTRINSIC_ALIGN_MUL"
-ALIGN_OFFSET = "NIR_INTRINSIC_ALIGN_OFFSET"
+ALIGN_MUL = intern("NIR_INTRINSIC_ALIGN_MUL")
+ALIGN_OFFSET = intern("NIR_INTRINSIC_ALIGN_OFFSET")
 # The vulkan descriptor type for vulkan_resource_index
-DESC_TYPE = "NIR_INTRINSIC_DESC_TYPE"
+DESC_TYPE = intern("NIR_INTRINSIC_DESC_TYPE")
 
 #
 # Possible flags:
 #
 
-CAN_ELIMINATE = "NIR_INTRINSIC_CAN_ELIMINATE"
-CAN_REORDER   = "NIR_INTRINSIC_CAN_REORDER"
-
-INTR_OPCODES = {}
-
-def intrinsic(name, src_comp=[], dest_comp=-1, indices=[],
-              flags=[], sysval=False, bit_sizes=[]):
-    assert name not in INTR_OPCODES
-    INTR_OPCODES[name] = Intrinsic(name, src_comp, dest_comp,
-                                   indices, flags, sysval, bit_sizes)
+CAN_ELIMINATE = intern("NIR_INTRINSIC_CAN_ELIMINATE")
+CAN_REORDER   = intern("NIR_INTRINSIC_CAN_REORDER")
+
+# Declarative table of (name, constructor arguments) filled in by the
+# intrinsic()/system_value()/... helpers below.  INTR_OPCODES is populated
+# from it in a single bulk pass at the end of this file, once every
+# definition has been seen.
+_INTR_TABLE = []
+
+# Shared empty tuple used for the defaulted list arguments below; a single
+# immutable object replaces hundreds of per-definition empty lists and
+# avoids the mutable-default-argument trap.
+_EMPTY = ()
+
+# Shared source-component tuples for the common all-scalar layouts; the
+# atomic families and the ir3 block alone repeat these dozens of times, so
+# reuse one immutable object per shape instead of a fresh list literal.
+TWO_SRCS   = (1, 1)
+THREE_SRCS = (1, 1, 1)
+FOUR_SRCS  = (1, 1, 1, 1)
+FIVE_SRCS  = (1, 1, 1, 1, 1)
+
+# Memo of every distinct component/index/flag/bit-size sequence seen so
+# far; hundreds of definitions repeat the same handful of values, so each
+# one is deduplicated to a single shared tuple at declaration time.
+_SEQ_MEMO = {}
+
+def _dedup(seq):
+    if seq is None:
+        return _EMPTY
+    seq = tuple(seq)
+    return _SEQ_MEMO.setdefault(seq, seq)
+
+def intrinsic(name, src_comp=None, dest_comp=-1, indices=None,
+              flags=None, sysval=False, bit_sizes=None):
+    src_comp = _dedup(src_comp)
+    indices = _dedup(indices)
+    flags = _dedup(flags)
+    bit_sizes = _dedup(bit_sizes)
+    # The source and index counts are fixed by the spec, so take the len()s
+    # here rather than once per constructed Intrinsic.
+    num_srcs = len(src_comp)
+    num_indices = len(indices)
+    # Record the fully-resolved constructor arguments as a plain tuple;
+    # the Intrinsic objects themselves are materialized in one bulk pass
+    # by _build_intr_opcodes().
+    _INTR_TABLE.append((name, num_srcs, src_comp, dest_comp,
+                        num_indices, indices, flags, sysval, bit_sizes))
 
 intrinsic("nop", flags=[CAN_ELIMINATE])
 
@@ -151,7 +193,7 @@ intrinsic("copy_deref", src_comp=[-1, -1])
 
 intrinsic("interp_deref_at_centroid", dest_comp=0, src_comp=[1],
           flags=[ CAN_ELIMINATE, CAN_REORDER])
-intrinsic("interp_deref_at_sample", src_comp=[1, 1], dest_comp=0,
+intrinsic("interp_deref_at_sample", src_comp=TWO_SRCS, dest_comp=0,
           flags=[CAN_ELIMINATE, CAN_REORDER])
 intrinsic("interp_deref_at_offset", src_comp=[1, 2], dest_comp=0,
           flags=[CAN_ELIMINATE, CAN_REORDER])
@@ -279,17 +321,29 @@ intrinsic("set_vertex_count", src_comp=[1])
 # The *_var variants take an atomic_uint nir_variable, while the other,
 # lowered, variants take a constant buffer index and register offset.
 
-def atomic(name, flags=[]):
-    intrinsic(name + "_deref", src_comp=[-1], dest_comp=1, flags=flags)
-    intrinsic(name, src_comp=[1], dest_comp=1, indices=[BASE], flags=flags)
+# Each atomic counter op expands to a deref variant and a lowered variant;
+# the two only differ in the name template, the first source and the
+# indices, so the expansion is driven by this table rather than by ad-hoc
+# string concatenation in each helper.
+_ATOMIC_VARIANTS = (
+    # (name template, first src_comp, indices)
+    ("{}_deref", [-1], None),
+    ("{}",       [1],  [BASE]),
+)
+
+def _atomic(name, num_data_srcs, flags=None):
+    for fmt, first_src, indices in _ATOMIC_VARIANTS:
+        intrinsic(fmt.format(name), src_comp=first_src + [1] * num_data_srcs,
+                  dest_comp=1, indices=indices, flags=flags)
+
+def atomic(name, flags=None):
+    _atomic(name, 0, flags)
 
 def atomic2(name):
-    intrinsic(name + "_deref", src_comp=[-1, 1], dest_comp=1)
-    intrinsic(name, src_comp=[1, 1], dest_comp=1, indices=[BASE])
+    _atomic(name, 1)
 
 def atomic3(name):
-    intrinsic(name + "_deref", src_comp=[-1, 1, 1], dest_comp=1)
-    intrinsic(name, src_comp=[1, 1, 1], dest_comp=1, indices=[BASE])
+    _atomic(name, 2)
 
 atomic("atomic_counter_inc")
 atomic("atomic_counter_pre_dec")
@@ -321,12 +375,21 @@ atomic3("atomic_counter_comp_swap")
 # argument with the value to be written, and image atomic operations take
 # either one or two additional scalar arguments with the same meaning as in
 # the ARB_shader_image_load_store specification.
-def image(name, src_comp=[], **kwargs):
-    intrinsic("image_deref_" + name, src_comp=[1] + src_comp, **kwargs)
-    intrinsic("image_" + name, src_comp=[1] + src_comp,
-              indices=[IMAGE_DIM, IMAGE_ARRAY, FORMAT, ACCESS], **kwargs)
-    intrinsic("bindless_image_" + name, src_comp=[1] + src_comp,
-              indices=[IMAGE_DIM, IMAGE_ARRAY, FORMAT, ACCESS], **kwargs)
+_IMAGE_INDICES = [IMAGE_DIM, IMAGE_ARRAY, FORMAT, ACCESS]
+
+# The three variants every image intrinsic expands to, as (name template,
+# indices); the deref variant carries its qualifiers on the image variable
+# instead of in constant indices.
+_IMAGE_VARIANTS = (
+    ("image_deref_{}",    None),
+    ("image_{}",          _IMAGE_INDICES),
+    ("bindless_image_{}", _IMAGE_INDICES),
+)
+
+def image(name, src_comp=None, **kwargs):
+    for fmt, indices in _IMAGE_VARIANTS:
+        intrinsic(fmt.format(name), src_comp=[1] + (src_comp or []),
+                  indices=indices, **kwargs)
 
 image("load", src_comp=[4, 1], dest_comp=0, flags=[CAN_ELIMINATE])
 image("store", src_comp=[4, 1, 0])
@@ -378,6 +441,21 @@ intrinsic("vulkan_resource_reindex", src_comp=[0, 1], dest_comp=0,
 intrinsic("load_vulkan_descriptor", src_comp=[-1], dest_comp=0,
           indices=[DESC_TYPE], flags=[CAN_ELIMINATE, CAN_REORDER])
 
+# The deref, SSBO, shared and global atomic families all expose the same
+# set of operations; the families only differ in the sources addressing the
+# memory and in the constant index, so each one is expanded from this
+# helper.  comp_swap/fcomp_swap take one extra data source.
+_ATOMIC_OPS = ("add", "imin", "umin", "imax", "umax", "and", "or", "xor",
+               "exchange", "comp_swap", "fadd", "fmin", "fmax",
+               "fcomp_swap")
+
+def memory_atomic(prefix, addr_srcs, indices):
+    for op in _ATOMIC_OPS:
+        num_data_srcs = 2 if op.endswith("comp_swap") else 1
+        intrinsic(prefix + "_atomic_" + op,
+                  src_comp=addr_srcs + (1,) * num_data_srcs,
+                  dest_comp=1, indices=indices)
+
 # variable atomic intrinsics
 #
 # All of these variable atomic memory operations read a value from memory,
@@ -391,20 +469,7 @@ intrinsic("load_vulkan_descriptor", src_comp=[-1], dest_comp=0,
 # 1: The data parameter to the atomic function (i.e. the value to add
 #    in shared_atomic_add, etc).
 # 2: For CompSwap only: the second data parameter.
-intrinsic("deref_atomic_add",  src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_imin", src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_umin", src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_imax", src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_umax", src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_and",  src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_or",   src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_xor",  src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_exchange", src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_comp_swap", src_comp=[-1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_fadd",  src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_fmin",  src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_fmax",  src_comp=[-1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("deref_atomic_fcomp_swap", src_comp=[-1, 1, 1], dest_comp=1, indices=[ACCESS])
+memory_atomic("deref", (-1,), [ACCESS])
 
 # SSBO atomic intrinsics
 #
@@ -421,20 +486,7 @@ intrinsic("deref_atomic_fcomp_swap", src_comp=[-1, 1, 1], dest_comp=1, indices=[
 # 2: The data parameter to the atomic function (i.e. the value to add
 #    in ssbo_atomic_add, etc).
 # 3: For CompSwap only: the second data parameter.
-intrinsic("ssbo_atomic_add",  src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_imin", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_umin", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_imax", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_umax", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_and",  src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_or",   src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_xor",  src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_exchange", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_comp_swap", src_comp=[1, 1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_fadd", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_fmin", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_fmax", src_comp=[1, 1, 1], dest_comp=1, indices=[ACCESS])
-intrinsic("ssbo_atomic_fcomp_swap", src_comp=[1, 1, 1, 1], dest_comp=1, indices=[ACCESS])
+memory_atomic("ssbo", TWO_SRCS, [ACCESS])
 
 # CS shared variable atomic intrinsics
 #
@@ -450,20 +502,7 @@ intrinsic("ssbo_atomic_fcomp_swap", src_comp=[1, 1, 1, 1], dest_comp=1, indices=
 # 1: The data parameter to the atomic function (i.e. the value to add
 #    in shared_atomic_add, etc).
 # 2: For CompSwap only: the second data parameter.
-intrinsic("shared_atomic_add",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_imin", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_umin", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_imax", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_umax", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_and",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_or",   src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_xor",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_exchange", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_comp_swap", src_comp=[1, 1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_fadd",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_fmin",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_fmax",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("shared_atomic_fcomp_swap", src_comp=[1, 1, 1], dest_comp=1, indices=[BASE])
+memory_atomic("shared", (1,), [BASE])
 
 # Global atomic intrinsics
 #
@@ -478,23 +517,10 @@ intrinsic("shared_atomic_fcomp_swap", src_comp=[1, 1, 1], dest_comp=1, indices=[
 # 1: The data parameter to the atomic function (i.e. the value to add
 #    in shared_atomic_add, etc).
 # 2: For CompSwap only: the second data parameter.
-intrinsic("global_atomic_add",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_imin", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_umin", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_imax", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_umax", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_and",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_or",   src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_xor",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_exchange", src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_comp_swap", src_comp=[1, 1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_fadd",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_fmin",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_fmax",  src_comp=[1, 1], dest_comp=1, indices=[BASE])
-intrinsic("global_atomic_fcomp_swap", src_comp=[1, 1, 1], dest_comp=1, indices=[BASE])
-
-def system_value(name, dest_comp, indices=[], bit_sizes=[32]):
-    intrinsic("load_" + name, [], dest_comp, indices,
+memory_atomic("global", (1,), [BASE])
+
+def system_value(name, dest_comp, indices=None, bit_sizes=(32,)):
+    intrinsic("load_" + name, _EMPTY, dest_comp, indices,
               flags=[CAN_ELIMINATE, CAN_REORDER], sysval=True,
               bit_sizes=bit_sizes)
 
@@ -531,11 +557,8 @@ system_value("layer_id", 1)
 system_value("view_index", 1)
 system_value("subgroup_size", 1)
 system_value("subgroup_invocation", 1)
-system_value("subgroup_eq_mask", 0, bit_sizes=[32, 64])
-system_value("subgroup_ge_mask", 0, bit_sizes=[32, 64])
-system_value("subgroup_gt_mask", 0, bit_sizes=[32, 64])
-system_value("subgroup_le_mask", 0, bit_sizes=[32, 64])
-system_value("subgroup_lt_mask", 0, bit_sizes=[32, 64])
+for cmp in ["eq", "ge", "gt", "le", "lt"]:
+    system_value("subgroup_" + cmp + "_mask", 0, bit_sizes=[32, 64])
 system_value("num_subgroups", 1)
 system_value("subgroup_id", 1)
 system_value("local_group_size", 3)
@@ -547,16 +570,12 @@ system_value("work_dim", 1)
 # VC4 and V3D need to emit a scaled version of the position in the vertex
 # shaders for binning, and having system values lets us move the math for that
 # into NIR.
-system_value("viewport_x_scale", 1)
-system_value("viewport_y_scale", 1)
-system_value("viewport_z_scale", 1)
-system_value("viewport_z_offset", 1)
+for name in ["x_scale", "y_scale", "z_scale", "z_offset"]:
+    system_value("viewport_" + name, 1)
 
 # Blend constant color values.  Float values are clamped.#
-system_value("blend_const_color_r_float", 1)
-system_value("blend_const_color_g_float", 1)
-system_value("blend_const_color_b_float", 1)
-system_value("blend_const_color_a_float", 1)
+for comp in "rgba":
+    system_value("blend_const_color_" + comp + "_float", 1)
 system_value("blend_const_color_rgba8888_unorm", 1)
 system_value("blend_const_color_aaaa8888_unorm", 1)
 
@@ -573,7 +592,7 @@ system_value("blend_const_color_aaaa8888_unorm", 1)
 # The vec2 value produced by these intrinsics is intended for use as the
 # barycoord source of a load_interpolated_input intrinsic.
 
-def barycentric(name, src_comp=[]):
+def barycentric(name, src_comp=None):
     intrinsic("load_barycentric_" + name, src_comp=src_comp, dest_comp=2,
               indices=[INTERP_MODE], flags=[CAN_ELIMINATE, CAN_REORDER])
 
@@ -606,41 +625,51 @@ barycentric("at_offset", [2])
 # varying slots and float units for fragment shader inputs.  UBO and SSBO
 # offsets are always in bytes.
 
-def load(name, num_srcs, indices=[], flags=[]):
+def load(name, num_srcs, indices=None, flags=None):
     intrinsic("load_" + name, [1] * num_srcs, dest_comp=0, indices=indices,
               flags=flags)
 
-# src[] = { offset }. const_index[] = { base, range }
-load("uniform", 1, [BASE, RANGE], [CAN_ELIMINATE, CAN_REORDER])
-# src[] = { buffer_index, offset }. const_index[] = { align_mul, align_offset }
-load("ubo", 2, [ALIGN_MUL, ALIGN_OFFSET], flags=[CAN_ELIMINATE, CAN_REORDER])
-# src[] = { offset }. const_index[] = { base, component }
-load("input", 1, [BASE, COMPONENT], [CAN_ELIMINATE, CAN_REORDER])
-# src[] = { vertex, offset }. const_index[] = { base, component }
-load("per_vertex_input", 2, [BASE, COMPONENT], [CAN_ELIMINATE, CAN_REORDER])
+# Every load_* variant as (name, num_srcs, indices, flags); the comment on
+# each entry gives the source and const_index layout.
+_LOADS = [
+    # src[] = { offset }. const_index[] = { base, range }
+    ("uniform", 1, [BASE, RANGE], [CAN_ELIMINATE, CAN_REORDER]),
+    # src[] = { buffer_index, offset }.
+    # const_index[] = { align_mul, align_offset }
+    ("ubo", 2, [ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE, CAN_REORDER]),
+    # src[] = { offset }. const_index[] = { base, component }
+    ("input", 1, [BASE, COMPONENT], [CAN_ELIMINATE, CAN_REORDER]),
+    # src[] = { vertex, offset }. const_index[] = { base, component }
+    ("per_vertex_input", 2, [BASE, COMPONENT], [CAN_ELIMINATE, CAN_REORDER]),
+    # src[] = { buffer_index, offset }.
+    # const_index[] = { access, align_mul, align_offset }
+    ("ssbo", 2, [ACCESS, ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE]),
+    # src[] = { offset }. const_index[] = { base, component }
+    ("output", 1, [BASE, COMPONENT], [CAN_ELIMINATE]),
+    # src[] = { vertex, offset }. const_index[] = { base }
+    ("per_vertex_output", 2, [BASE, COMPONENT], [CAN_ELIMINATE]),
+    # src[] = { offset }. const_index[] = { base, align_mul, align_offset }
+    ("shared", 1, [BASE, ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE]),
+    # src[] = { offset }. const_index[] = { base, range }
+    ("push_constant", 1, [BASE, RANGE], [CAN_ELIMINATE, CAN_REORDER]),
+    # src[] = { offset }. const_index[] = { base, range }
+    ("constant", 1, [BASE, RANGE], [CAN_ELIMINATE, CAN_REORDER]),
+    # src[] = { address }.
+    # const_index[] = { access, align_mul, align_offset }
+    ("global", 1, [ACCESS, ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE]),
+    # src[] = { address }.
+    # const_index[] = { base, range, align_mul, align_offset }
+    ("kernel_input", 1, [BASE, RANGE, ALIGN_MUL, ALIGN_OFFSET],
+     [CAN_ELIMINATE, CAN_REORDER]),
+]
+
+for _load_spec in _LOADS:
+    load(*_load_spec)
+
 # src[] = { barycoord, offset }. const_index[] = { base, component }
 intrinsic("load_interpolated_input", src_comp=[2, 1], dest_comp=0,
           indices=[BASE, COMPONENT], flags=[CAN_ELIMINATE, CAN_REORDER])
 
-# src[] = { buffer_index, offset }.
-# const_index[] = { access, align_mul, align_offset }
-load("ssbo", 2, [ACCESS, ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE])
-# src[] = { offset }. const_index[] = { base, component }
-load("output", 1, [BASE, COMPONENT], flags=[CAN_ELIMINATE])
-# src[] = { vertex, offset }. const_index[] = { base }
-load("per_vertex_output", 2, [BASE, COMPONENT], [CAN_ELIMINATE])
-# src[] = { offset }. const_index[] = { base, align_mul, align_offset }
-load("shared", 1, [BASE, ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE])
-# src[] = { offset }. const_index[] = { base, range }
-load("push_constant", 1, [BASE, RANGE], [CAN_ELIMINATE, CAN_REORDER])
-# src[] = { offset }. const_index[] = { base, range }
-load("constant", 1, [BASE, RANGE], [CAN_ELIMINATE, CAN_REORDER])
-# src[] = { address }.
-# const_index[] = { access, align_mul, align_offset }
-load("global", 1, [ACCESS, ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE])
-# src[] = { address }. const_index[] = { base, range, align_mul, align_offset }
-load("kernel_input", 1, [BASE, RANGE, ALIGN_MUL, ALIGN_OFFSET], [CAN_ELIMINATE, CAN_REORDER])
-
 # Stores work the same way as loads, except now the first source is the value
 # to store and the second (and possibly third) source specify where to store
 # the value.  SSBO and shared memory stores also have a write mask as
@@ -678,15 +707,89 @@ store("global", 2, [WRMASK, ACCESS, ALIGN_MUL, ALIGN_OFFSET])
 # by the backend.
 intrinsic("store_ssbo_ir3",  src_comp=[0, 1, 1, 1],
           indices=[WRMASK, ACCESS, ALIGN_MUL, ALIGN_OFFSET])
-intrinsic("load_ssbo_ir3",  src_comp=[1, 1, 1], dest_comp=0,
+intrinsic("load_ssbo_ir3",  src_comp=THREE_SRCS, dest_comp=0,
           indices=[ACCESS, ALIGN_MUL, ALIGN_OFFSET], flags=[CAN_ELIMINATE])
-intrinsic("ssbo_atomic_add_ir3",        src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_imin_ir3",       src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_umin_ir3",       src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_imax_ir3",       src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_umax_ir3",       src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_and_ir3",        src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_or_ir3",         src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_xor_ir3",        src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_exchange_ir3",   src_comp=[1, 1, 1, 1],    dest_comp=1)
-intrinsic("ssbo_atomic_comp_swap_ir3",  src_comp=[1, 1, 1, 1, 1], dest_comp=1)
+intrinsic("ssbo_atomic_add_ir3",        src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_imin_ir3",       src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_umin_ir3",       src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_imax_ir3",       src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_umax_ir3",       src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_and_ir3",        src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_or_ir3",         src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_xor_ir3",        src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_exchange_ir3",   src_comp=FOUR_SRCS,    dest_comp=1)
+intrinsic("ssbo_atomic_comp_swap_ir3",  src_comp=FIVE_SRCS,    dest_comp=1)
+
+# Build INTR_OPCODES in bulk from the declarative table.
+def _build_intr_opcodes():
+    # Building the table is bound by allocating the Intrinsic objects, not
+    # by the dict inserts, so feed them to one bulk update() from a
+    # generator expression and detect duplicates with a single length
+    # comparison afterwards; the name hunt only runs on the failure path.
+    opcodes = OrderedDict()
+    opcodes.update((spec[0], Intrinsic(*spec)) for spec in _INTR_TABLE)
+    if len(opcodes) != len(_INTR_TABLE):
+        seen = set()
+        for spec in _INTR_TABLE:
+            if spec[0] in seen:
+                raise ValueError("duplicate intrinsic name: " + spec[0])
+            seen.add(spec[0])
+    # Every generator walks the table sorted by name, so lay the dict out
+    # in that order once here, and freeze it behind a read-only view so no
+    # consumer can mutate it after the fact.
+    return MappingProxyType(OrderedDict(sorted(opcodes.items())))
+
+INTR_OPCODES = _build_intr_opcodes()
+
+# Validate the complete table in a single pass rather than asserting on
+# every field of every Intrinsic as it is constructed; with several
+# hundred opcodes the per-call assertions were a measurable fraction of
+# import time for the generators.
+def _validate_intr_opcodes():
+    for opcode in INTR_OPCODES.values():
+        assert isinstance(opcode.name, str)
+        assert opcode.num_srcs == len(opcode.src_components)
+        assert opcode.num_indices == len(opcode.indices)
+        assert isinstance(opcode.src_components, (list, tuple))
+        if opcode.src_components:
+            assert isinstance(opcode.src_components[0], int)
+        assert isinstance(opcode.dest_components, int)
+        assert isinstance(opcode.indices, (list, tuple))
+        if opcode.indices:
+            assert isinstance(opcode.indices[0], str)
+        assert isinstance(opcode.flags, (list, tuple))
+        if opcode.flags:
+            assert isinstance(opcode.flags[0], str)
+        assert isinstance(opcode.sysval, bool)
+        if opcode.bit_sizes:
+            assert isinstance(opcode.bit_sizes[0], int)
+
+_validate_intr_opcodes()
+
+# Plain-data snapshot of the table: one tuple of fields per opcode, in
+# sorted order.  This is what gets pickled at build time; keeping it free
+# of Intrinsic instances means unpickling it does not re-import (and thus
+# rebuild) this module.
+def intrinsic_rows():
+    return [(op.name, op.num_srcs, op.src_components, op.has_dest,
+             op.dest_components, op.num_indices, op.indices, op.flags,
+             op.sysval, op.bit_sizes)
+            for op in INTR_OPCODES.values()]
+
+def main():
+    import argparse
+    import os
+    import pickle
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--outdir', required=True,
+                        help='Directory to put the pickled table in')
+
+    args = parser.parse_args()
+
+    path = os.path.join(args.outdir, 'nir_intrinsics.pkl')
+    with open(path, 'wb') as f:
+        pickle.dump(intrinsic_rows(), f, pickle.HIGHEST_PROTOCOL)
+
+if __name__ == '__main__':
+    main()
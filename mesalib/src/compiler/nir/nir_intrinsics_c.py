@@ -27,47 +27,79 @@ template = """\
 #include "nir.h"
 
 const nir_intrinsic_info nir_intrinsic_infos[nir_num_intrinsics] = {
-% for name, opcode in sorted(INTR_OPCODES.items()):
+% for i in range(num_opcodes):
 {
-   .name = "${name}",
-   .num_srcs = ${opcode.num_srcs},
-% if opcode.src_components:
+   .name = "${names[i]}",
+   .num_srcs = ${num_srcs[i]},
+% if src_components[i]:
    .src_components = {
-      ${", ".join(str(comp) for comp in opcode.src_components)}
+      ${", ".join(str(comp) for comp in src_components[i])}
    },
 % endif
-   .has_dest = ${"true" if opcode.has_dest else "false"},
-   .dest_components = ${max(opcode.dest_components, 0)},
-   .dest_bit_sizes = ${hex(reduce(operator.or_, opcode.bit_sizes, 0))},
-   .num_indices = ${opcode.num_indices},
-% if opcode.indices:
+   .has_dest = ${"true" if has_dest[i] else "false"},
+   .dest_components = ${max(dest_components[i], 0)},
+   .dest_bit_sizes = ${dest_bit_sizes[i]},
+   .num_indices = ${num_indices[i]},
+% if indices[i]:
    .index_map = {
-% for i in range(len(opcode.indices)):
-      [${opcode.indices[i]}] = ${i + 1},
+% for j in range(len(indices[i])):
+      [${indices[i][j]}] = ${j + 1},
 % endfor
     },
 % endif
-   .flags = ${"0" if len(opcode.flags) == 0 else " | ".join(opcode.flags)},
+   .flags = ${"0" if len(flags[i]) == 0 else " | ".join(flags[i])},
 },
 % endfor
 };
 """
 
-from nir_intrinsics import INTR_OPCODES
 from mako.template import Template
 import argparse
 import os
+import pickle
+
+def intrinsic_soa(rows):
+    """Transpose the opcode rows into parallel per-field columns, sorted by
+    name, so the template indexes packed arrays instead of chasing
+    attributes on a list of objects."""
+    (names, num_srcs, src_components, has_dest, dest_components,
+     num_indices, indices, flags, _sysval, bit_sizes) = zip(*rows)
+    return {
+        'num_opcodes': len(names),
+        'names': names,
+        'num_srcs': num_srcs,
+        'src_components': src_components,
+        'has_dest': has_dest,
+        'dest_components': dest_components,
+        # Partial-evaluate the bit-size mask for every opcode here, so the
+        # template just splices precomputed hex strings.
+        'dest_bit_sizes': [hex(reduce(operator.or_, sizes, 0))
+                           for sizes in bit_sizes],
+        'num_indices': num_indices,
+        'indices': indices,
+        'flags': flags,
+    }
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--outdir', required=True,
                         help='Directory to put the generated files in')
+    parser.add_argument('--pickle', required=False, default=None,
+                        help='Pickled table written by nir_intrinsics.py, '
+                             'loaded instead of rebuilding the table')
 
     args = parser.parse_args()
 
+    if args.pickle:
+        with open(args.pickle, 'rb') as f:
+            rows = pickle.load(f)
+    else:
+        from nir_intrinsics import intrinsic_rows
+        rows = intrinsic_rows()
+
     path = os.path.join(args.outdir, 'nir_intrinsics.c')
     with open(path, 'wb') as f:
-        f.write(Template(template, output_encoding='utf-8').render(INTR_OPCODES=INTR_OPCODES, reduce=reduce, operator=operator))
+        f.write(Template(template, output_encoding='utf-8').render(**intrinsic_soa(rows)))
 
 if __name__ == '__main__':
     main()
@@ -38,22 +38,33 @@ typedef enum {
 
 #endif /* _NIR_INTRINSICS_ */"""
 
-from nir_intrinsics import INTR_OPCODES
 from mako.template import Template
 import argparse
 import os
+import pickle
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--outdir', required=True,
                         help='Directory to put the generated files in')
+    parser.add_argument('--pickle', required=False, default=None,
+                        help='Pickled table written by nir_intrinsics.py, '
+                             'loaded instead of rebuilding the table')
 
     args = parser.parse_args()
 
+    if args.pickle:
+        with open(args.pickle, 'rb') as f:
+            opcode_names = [row[0] for row in pickle.load(f)]
+    else:
+        from nir_intrinsics import INTR_OPCODES
+        opcode_names = list(INTR_OPCODES)
+
     path = os.path.join(args.outdir, 'nir_intrinsics.h')
     with open(path, 'wb') as f:
-        f.write(Template(template, output_encoding='utf-8').render(INTR_OPCODES=INTR_OPCODES))
+        f.write(Template(template, output_encoding='utf-8').render(
+            INTR_OPCODES=opcode_names))
 
 if __name__ == '__main__':
     main()
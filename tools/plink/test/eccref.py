@@ -16,9 +16,13 @@ def jacobi(n,m):
         n %= m
         if n == 0:
             return 0
-        while not (n & 1):
-            n >>= 1
-            if (m & 7) not in {1,7}:
+        # Strip all factors of 2 from n in one go, in the style of the
+        # binary GCD. Each factor flips the sign iff m is congruent to
+        # 3 or 5 mod 8, so only the parity of the count matters.
+        twos = (n & -n).bit_length() - 1
+        if twos > 0:
+            n >>= twos
+            if (twos & 1) and (m & 7) not in {1,7}:
                 acc *= -1
         if n == 1:
             return acc
@@ -167,6 +171,11 @@ class ModP(object):
     def __ne__(self, rhs):
         rhs = self.coerce_to(rhs)
         return self.n != rhs.n
+    def __hash__(self):
+        # Defining __eq__ suppresses the default hash, but these are
+        # immutable values, so make them hashable again; this is what
+        # makes AffinePoint.__hash__ actually work.
+        return hash((self.p, self.n))
     def __lt__(self, rhs):
         raise ValueError("Elements of a modular ring have no ordering")
     def __le__(self, rhs):
@@ -122,7 +122,9 @@ class Value(object):
         hexval = childprocess.funcall("mp_dump", [self.ident])[0]
         return 0 if len(hexval) == 0 else int(hexval, 16)
     def __int__(self):
-        return int(self.__long__())
+        # __long__ already returns a plain integer, so don't pay for a
+        # second conversion of a potentially multi-hundred-bit value.
+        return self.__long__()
 
 def make_argword(arg, argtype, fnname, argindex, to_preserve):
     typename, consumed = argtype